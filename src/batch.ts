@@ -0,0 +1,25 @@
+import { availableParallelism } from "os";
+
+export const FILE_CONCURRENCY = Math.max(4, availableParallelism());
+
+// Run fn over items with at most `limit` in flight; results keep input order.
+// After the first failure no new items are started, and the error is only rethrown
+// once the items already in flight have settled, so nothing runs behind the caller.
+export async function mapConcurrent<T, R>(items: T[], limit: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+  let failure: { error: unknown } | undefined;
+  async function worker(): Promise<void> {
+    while (!failure && next < items.length) {
+      const i = next++;
+      try {
+        results[i] = await fn(items[i]);
+      } catch (error) {
+        failure ??= { error };
+      }
+    }
+  }
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  if (failure) throw failure.error;
+  return results;
+}
@@ -0,0 +1,90 @@
+import { createHash } from "crypto";
+import fs from "fs/promises";
+import { FILE_CONCURRENCY, mapConcurrent } from "./batch";
+import { readFileUtf8, writeFileUtf8, type Format } from "./formats";
+
+export const DEFAULT_FORMAT_CACHE = ".allcoder-cache.json";
+
+export function contentHash(text: string): string {
+  return createHash("sha1").update(text).digest("base64");
+}
+
+// Maps file path -> hash of its content when it was last known to be formatted.
+// Entries only count for the `settings` (CLI version + format options) they were saved with.
+export type FormatCache = { file: string; settings: string; files: Map<string, string>; dirty: boolean };
+
+export interface FormatResult {
+  hash: string; // hash of the content that was read
+  output: string;
+  differs: boolean;
+  written: boolean; // output was written back to the file
+}
+
+export interface FormatCacheOptions {
+  format?: Format; // explicit --format; undefined means detected per file
+  indent: number;
+  sortKeys: boolean;
+}
+
+// Everything that changes formatter output: a cache saved under other settings is discarded
+export function formatCacheSettings(version: string, options: FormatCacheOptions): string {
+  return JSON.stringify([version, options.format ?? null, options.indent, options.sortKeys]);
+}
+
+export async function loadFormatCache(file: string, settings: string): Promise<FormatCache> {
+  const cache: FormatCache = { file, settings, files: new Map(), dirty: false };
+  try {
+    const raw = JSON.parse(await readFileUtf8(file)) as { settings?: string; files?: Record<string, string> };
+    if (raw.settings === settings && raw.files) {
+      cache.files = new Map(Object.entries(raw.files));
+    }
+  } catch {
+    // Missing or unreadable cache; start fresh
+  }
+  return cache;
+}
+
+export async function saveFormatCache(cache: FormatCache): Promise<void> {
+  if (!cache.dirty) return;
+  const body = { settings: cache.settings, files: Object.fromEntries(cache.files) };
+  await writeFileUtf8(cache.file, JSON.stringify(body) + "\n");
+  cache.dirty = false;
+}
+
+export function isKnownFormatted(cache: FormatCache, file: string, hash: string): boolean {
+  return cache.files.get(file) === hash;
+}
+
+export function recordFormatResult(cache: FormatCache, file: string, result: FormatResult): void {
+  if (result.differs && !result.written) {
+    // Still needs formatting; never cache it
+    if (cache.files.delete(file)) cache.dirty = true;
+    return;
+  }
+  const hash = result.differs ? contentHash(result.output) : result.hash;
+  if (cache.files.get(file) !== hash) {
+    cache.files.set(file, hash);
+    cache.dirty = true;
+  }
+}
+
+// Drop entries for files that no longer exist (deleted or renamed) so the cache does
+// not grow forever; files matched in this run are known to exist and are not checked
+export async function pruneFormatCache(cache: FormatCache, matched: Iterable<string>): Promise<void> {
+  const seen = new Set(matched);
+  const candidates = [...cache.files.keys()].filter((f) => !seen.has(f));
+  const missing = await mapConcurrent(candidates, FILE_CONCURRENCY, async (f) => {
+    try {
+      await fs.access(f);
+      return false;
+    } catch {
+      return true;
+    }
+  });
+  candidates.forEach((f, i) => {
+    if (missing[i]) {
+      cache.files.delete(f);
+      cache.dirty = true;
+    }
+  });
+}
@@ -1,31 +1,25 @@
 #!/usr/bin/env node
 import { Command, Option } from "commander";
 import fg from "fast-glob";
-import { detectFormatFromPath, parseByFormat, stringifyByFormat, type Format, readFileUtf8, writeFileUtf8, sortKeysDeep } from "./formats";
-import { mergeDeep } from "./merge";
+import { detectFormatFromPath, parseByFormat, resolveFormat, stringifyByFormat, type Format, readFileUtf8, writeFileUtf8, sortKeysDeep } from "./formats";
+import { mergeDeepAll } from "./merge";
 import { redact } from "./redact";
+import { compileSchema, formatSchemaErrors } from "./schema";
+import { FILE_CONCURRENCY, mapConcurrent } from "./batch";
+import { DEFAULT_FORMAT_CACHE } from "./cache";
+import { formatFiles } from "./files";
 import pkg from "../package.json";
-import Ajv, { ErrorObject } from "ajv";
 
 async function readStdin(): Promise<string> {
   return await new Promise((resolve, reject) => {
-    let data = "";
-    process.stdin.setEncoding("utf8");
-    process.stdin.on("data", (chunk) => (data += chunk));
-    process.stdin.on("end", () => resolve(data));
+    // Collect raw chunks and decode once instead of growing a string per chunk
+    const chunks: Buffer[] = [];
+    process.stdin.on("data", (chunk: Buffer) => chunks.push(chunk));
+    process.stdin.on("end", () => resolve(Buffer.concat(chunks).toString("utf8")));
     process.stdin.on("error", reject);
   });
 }
 
-function resolveFormat(fromOpt: string | undefined, file: string | undefined): Format {
-  if (fromOpt) return fromOpt as Format;
-  if (file) {
-    const f = detectFormatFromPath(file);
-    if (f) return f;
-  }
-  throw new Error("Unable to detect format; please specify --format");
-}
-
 function parseInput(text: string, format: Format): unknown {
   return parseByFormat(format, text);
 }
@@ -63,14 +57,10 @@ program
         const schemaText = await readFileUtf8(opts.schema);
         const sFmt = detectFormatFromPath(opts.schema) ?? "json";
         const schema = parseInput(schemaText, sFmt) as object;
-        const ajv = new Ajv({ allErrors: true });
-        const validate = ajv.compile(schema);
-        const ok = validate(data);
-        if (!ok) {
-          const details = (validate.errors ?? [])
-            .map((e: ErrorObject) => `${e.instancePath ?? '/'} ${e.message}`)
-            .join("; ") || "Invalid";
-          throw new Error(`Schema validation failed: ${details}`);
+        // Quiet mode only reports pass/fail, so let Ajv bail out on the first error
+        const validate = compileSchema(schema, { allErrors: !opts.quiet });
+        if (!validate(data)) {
+          throw new Error(`Schema validation failed: ${formatSchemaErrors(validate.errors)}`);
         }
       }
       if (!opts.quiet) console.log(`${file ?? "stdin"}: valid ${fmt.toUpperCase()}`);
@@ -86,11 +76,13 @@ program
   .description("Format config file(s)")
   .addOption(formatOption)
   .argument("[files...]", "file(s) or glob(s) to format; omit to read from stdin")
-  .option("-w, --write", "write result back to file (required for multiple files)")
+  .option("-w, --write", "write result back to file (required for multiple files unless --check)")
   .option("--check", "check if files are formatted; exit 1 if changes would be made")
   .option("--sort-keys", "sort keys recursively")
   .option("--indent <n>", "indent size (JSON/YAML)", (v) => parseInt(v, 10), 2)
-  .action(async (files: string[] | undefined, opts: { format?: Format; write?: boolean; check?: boolean; sortKeys?: boolean; indent?: number }) => {
+  .option("--cache", "with --check/--write, skip files unchanged since they were last formatted")
+  .option("--cache-location <file>", "where --cache stores its state", DEFAULT_FORMAT_CACHE)
+  .action(async (files: string[] | undefined, opts: { format?: Format; write?: boolean; check?: boolean; sortKeys?: boolean; indent?: number; cache?: boolean; cacheLocation?: string }) => {
     try {
       const patterns = files ?? [];
       if (patterns.length === 0) {
@@ -108,28 +100,24 @@ program
         return;
       }
 
-      const filesToProcess = await expandFiles(patterns);
-      if (filesToProcess.length > 1 && !opts.write) {
-        throw new Error("Formatting multiple files requires --write");
-      }
+      const results = await formatFiles(await expandFiles(patterns), {
+        format: opts.format,
+        indent: opts.indent ?? 2,
+        sortKeys: !!opts.sortKeys,
+        check: !!opts.check,
+        write: !!opts.write,
+        cache: opts.cache ? { location: opts.cacheLocation ?? DEFAULT_FORMAT_CACHE, version: pkg.version } : undefined,
+      });
       let changed = false;
-      for (const file of filesToProcess) {
-        const fmt = resolveFormat(opts.format, file);
-        const text = await readFileUtf8(file);
-        const parsed = parseInput(text, fmt);
-        const output = stringifyByFormat(fmt, parsed, { indent: opts.indent ?? 2, sortKeys: !!opts.sortKeys });
+      for (const { file, differs, output } of results) {
         if (opts.check) {
-          if (output !== text) {
+          if (differs) {
             console.error(`${file}: needs formatting`);
             changed = true;
           }
           continue;
         }
-        if (opts.write) {
-          if (output !== text) await writeFileUtf8(file, output);
-        } else {
-          process.stdout.write(output);
-        }
+        if (output !== undefined) process.stdout.write(output);
       }
       if (opts.check && changed) process.exitCode = 1;
     } catch (err) {
@@ -171,11 +159,9 @@ program
     try {
       if (files.length < 2) throw new Error("Provide at least two files to merge");
       const fmt = resolveFormat(opts.format, files[0]);
-      let acc = parseInput(await readFileUtf8(files[0]), fmt);
-      for (const f of files.slice(1)) {
-        const next = parseInput(await readFileUtf8(f), fmt);
-        acc = mergeDeep(acc as unknown, next, { arrayStrategy: opts.array }) as unknown;
-      }
+      // Read every input up front so the file I/O overlaps, then fold in order
+      const texts = await mapConcurrent(files, FILE_CONCURRENCY, readFileUtf8);
+      const acc = mergeDeepAll(texts.map((text) => parseInput(text, fmt)), { arrayStrategy: opts.array });
       const out = stringifyByFormat(fmt, acc, { indent: opts.indent ?? 2, sortKeys: !!opts.sortKeys });
       process.stdout.write(out);
     } catch (err) {
@@ -0,0 +1,80 @@
+import path from "path";
+import { parseByFormat, readFileUtf8, resolveFormat, stringifyByFormat, writeFileUtf8, type Format } from "./formats";
+import { FILE_CONCURRENCY, mapConcurrent } from "./batch";
+import {
+  contentHash,
+  formatCacheSettings,
+  isKnownFormatted,
+  loadFormatCache,
+  pruneFormatCache,
+  recordFormatResult,
+  saveFormatCache,
+} from "./cache";
+
+export interface FormatFilesOptions {
+  format?: Format;
+  indent: number;
+  sortKeys: boolean;
+  check: boolean; // only report which files differ
+  write: boolean; // write changed files back
+  cache?: { location: string; version: string };
+}
+
+export interface FormattedFile {
+  file: string;
+  differs: boolean;
+  output?: string; // only set when neither check nor write, i.e. for printing
+}
+
+export async function formatFiles(files: string[], options: FormatFilesOptions): Promise<FormattedFile[]> {
+  const { format, indent, sortKeys, check, write } = options;
+  let targets = files;
+  if (options.cache) {
+    // Never format (and then clobber) the cache file itself when a glob matches it
+    const cachePath = path.resolve(options.cache.location);
+    targets = targets.filter((f) => path.resolve(f) !== cachePath);
+  }
+  // Printing is the only mode that can't handle several files; check writes nothing to stdout
+  if (targets.length > 1 && !write && !check) {
+    throw new Error("Formatting multiple files requires --write");
+  }
+  const cache =
+    options.cache && (check || write)
+      ? await loadFormatCache(options.cache.location, formatCacheSettings(options.cache.version, { format, indent, sortKeys }))
+      : undefined;
+  // Output depends only on (format, content) within a run, so identical copies of an
+  // already formatted file (tsconfig/.eslintrc across packages) skip the parse;
+  // only keys are kept, never file contents
+  const formattedContent = new Set<string>();
+  const writeBack = !check && write;
+  // Reads overlap across files; results stay in input order. Only the output of
+  // files that will be written (or printed) is kept.
+  const results = await mapConcurrent(targets, FILE_CONCURRENCY, async (file) => {
+    const fmt = resolveFormat(format, file);
+    const text = await readFileUtf8(file);
+    const hash = contentHash(text);
+    if (cache && isKnownFormatted(cache, file, hash)) return { file, hash, differs: false, output: undefined };
+    const contentKey = `${fmt}:${hash}`;
+    const output = formattedContent.has(contentKey)
+      ? text
+      : stringifyByFormat(fmt, parseByFormat(fmt, text), { indent, sortKeys });
+    const differs = output !== text;
+    if (!differs) formattedContent.add(contentKey);
+    const keep = !check && (!write || differs);
+    return { file, hash, differs, output: keep ? output : undefined };
+  });
+  // Nothing is written until every file has formatted, so a parse error anywhere
+  // leaves all files untouched instead of a timing-dependent subset
+  if (writeBack) {
+    const pending = results.flatMap((r) => (r.differs && r.output !== undefined ? [{ file: r.file, output: r.output }] : []));
+    await mapConcurrent(pending, FILE_CONCURRENCY, (r) => writeFileUtf8(r.file, r.output));
+  }
+  if (cache) {
+    for (const { file, hash, differs, output } of results) {
+      recordFormatResult(cache, file, { hash, output: output ?? "", differs, written: writeBack && differs });
+    }
+    await pruneFormatCache(cache, targets);
+    await saveFormatCache(cache);
+  }
+  return results.map(({ file, differs, output }) => ({ file, differs, output: check || write ? undefined : output }));
+}
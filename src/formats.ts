@@ -4,18 +4,10 @@ import { parse as parseToml, stringify as stringifyToml } from "@iarna/toml";
 import YAML from "yaml";
 import JSON5 from "json5";
 import { parse as parseJsonc } from "jsonc-parser";
+import { isPlainObject } from "./object";
 
 export type Format = "json" | "yaml" | "toml" | "jsonc" | "json5";
 
-function isPlainObject(value: unknown): value is Record<string, unknown> {
-  return (
-    typeof value === "object" &&
-    value !== null &&
-    !Array.isArray(value) &&
-    Object.prototype.toString.call(value) === "[object Object]"
-  );
-}
-
 export function sortKeysDeep(value: unknown): unknown {
   if (Array.isArray(value)) return value.map(sortKeysDeep);
   if (isPlainObject(value)) {
@@ -28,31 +20,109 @@ export function sortKeysDeep(value: unknown): unknown {
   return value;
 }
 
+const EXTENSION_FORMATS = new Map<string, Format>([
+  [".json", "json"],
+  [".jsonc", "jsonc"],
+  [".json5", "json5"],
+  [".yml", "yaml"],
+  [".yaml", "yaml"],
+  [".toml", "toml"],
+]);
+
 export function detectFormatFromPath(filePath: string): Format | null {
-  const ext = path.extname(filePath).toLowerCase();
-  if (ext === ".json") return "json";
-  if (ext === ".jsonc") return "jsonc";
-  if (ext === ".json5") return "json5";
-  if (ext === ".yml" || ext === ".yaml") return "yaml";
-  if (ext === ".toml") return "toml";
-  return null;
+  return EXTENSION_FORMATS.get(path.extname(filePath).toLowerCase()) ?? null;
 }
 
-export function parseByFormat(format: Format, input: string): unknown {
-  switch (format) {
-    case "json":
-      return JSON.parse(input) as unknown;
-    case "jsonc":
-      return parseJsonc(input) as unknown;
-    case "json5":
-      return JSON5.parse(input) as unknown;
-    case "yaml":
-      return YAML.parse(input) as unknown;
-    case "toml":
-      return parseToml(input) as unknown;
-    default:
-      throw new Error(`Unsupported format: ${format}`);
+export function resolveFormat(fromOpt: string | undefined, file: string | undefined): Format {
+  if (fromOpt) return fromOpt as Format;
+  if (file) {
+    const f = detectFormatFromPath(file);
+    if (f) return f;
+  }
+  throw new Error("Unable to detect format; please specify --format");
+}
+
+// Strict JSON is valid JSONC/JSON5, so try the native parser before the JS ones
+function parseJsonFirst(input: string, fallback: (text: string) => unknown): unknown {
+  try {
+    return JSON.parse(input) as unknown;
+  } catch {
+    return fallback(input);
+  }
+}
+
+const parseJsoncText = (text: string): unknown => parseJsonc(text) as unknown;
+const parseJson5Text = (text: string): unknown => JSON5.parse(text) as unknown;
+const parseYamlText = (text: string): unknown => YAML.parse(text) as unknown;
+
+// Number of name/value separators in text already accepted by JSON.parse; outside
+// strings a ':' can only separate an object key from its value
+function countJsonMembers(text: string): number {
+  let count = 0;
+  let inString = false;
+  for (let i = 0; i < text.length; i++) {
+    const c = text.charCodeAt(i);
+    if (inString) {
+      if (c === 92) i++; // backslash escapes the next char
+      else if (c === 34) inString = false;
+    } else if (c === 34) {
+      inString = true;
+    } else if (c === 58) {
+      count++;
+    }
+  }
+  return count;
+}
+
+function countKeys(value: unknown): number {
+  if (typeof value !== "object" || value === null) return 0;
+  let count = 0;
+  if (Array.isArray(value)) {
+    for (const item of value) count += countKeys(item);
+    return count;
   }
+  for (const k of Object.keys(value)) count += 1 + countKeys((value as Record<string, unknown>)[k]);
+  return count;
+}
+
+function firstNonSpace(text: string): string | undefined {
+  for (let i = 0; i < text.length; i++) {
+    const c = text.charCodeAt(i);
+    if (c !== 32 && c !== 9 && c !== 10 && c !== 13) return text[i];
+  }
+  return undefined;
+}
+
+// YAML 1.2 is a superset of JSON; documents that open with a flow collection are
+// usually plain JSON, which the native parser handles without composing a YAML AST.
+// JSON.parse silently keeps the last duplicate key where YAML rejects it, so the
+// fast result is only used when no member was collapsed.
+function parseYaml(input: string): unknown {
+  const first = firstNonSpace(input);
+  if (first === "{" || first === "[") {
+    let value: unknown;
+    try {
+      value = JSON.parse(input) as unknown;
+    } catch {
+      return parseYamlText(input);
+    }
+    if (countKeys(value) === countJsonMembers(input)) return value;
+  }
+  return parseYamlText(input);
+}
+
+const PARSERS = new Map<Format, (input: string) => unknown>([
+  ["json", (input) => JSON.parse(input) as unknown],
+  ["jsonc", (input) => parseJsonFirst(input, parseJsoncText)],
+  ["json5", (input) => parseJsonFirst(input, parseJson5Text)],
+  ["yaml", parseYaml],
+  ["toml", (input) => parseToml(input) as unknown],
+]);
+
+export function parseByFormat(format: Format, input: string): unknown {
+  const parse = PARSERS.get(format);
+  if (!parse) throw new Error(`Unsupported format: ${format}`);
+  return parse(input);
 }
 
 export interface StringifyOptions {
@@ -60,26 +130,26 @@ export interface StringifyOptions {
   sortKeys?: boolean;
 }
 
+const stringifyJson = (value: unknown, indent: number): string => JSON.stringify(value, null, indent) + "\n";
+
+const STRINGIFIERS = new Map<Format, (value: unknown, indent: number) => string>([
+  ["json", stringifyJson],
+  ["jsonc", stringifyJson],
+  ["json5", stringifyJson],
+  ["yaml", (value, indent) => YAML.stringify(value, { indent })],
+  // toml library controls formatting; indent option is ignored
+  ["toml", (value) => stringifyToml(value as unknown as Parameters<typeof stringifyToml>[0])],
+]);
+
 export function stringifyByFormat(
   format: Format,
   value: unknown,
   options: StringifyOptions = {}
 ): string {
   const { indent = 2, sortKeys = false } = options;
-  const val = sortKeys ? sortKeysDeep(value) : value;
-  switch (format) {
-    case "json":
-    case "jsonc":
-    case "json5":
-      return JSON.stringify(val, null, indent) + "\n";
-    case "yaml":
-      return YAML.stringify(val, { indent });
-    case "toml":
-      // toml library controls formatting; indent option may be ignored
-      return stringifyToml(val as unknown as Parameters<typeof stringifyToml>[0]);
-    default:
-      throw new Error(`Unsupported format: ${format}`);
-  }
+  const stringify = STRINGIFIERS.get(format);
+  if (!stringify) throw new Error(`Unsupported format: ${format}`);
+  return stringify(sortKeys ? sortKeysDeep(value) : value, indent);
 }
 
 export async function readFileUtf8(file: string): Promise<string> {
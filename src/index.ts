@@ -2,3 +2,4 @@ export * from "./json";
 export * from "./formats";
 export * from "./merge";
 export * from "./redact";
+export * from "./schema";
@@ -1,14 +1,62 @@
+import { isPlainObject } from "./object";
+
 export type MergeOptions = {
   arrayStrategy?: "replace" | "concat";
 };
 
-function isPlainObject(value: unknown): value is Record<string, unknown> {
-  return (
-    typeof value === "object" &&
-    value !== null &&
-    !Array.isArray(value) &&
-    Object.prototype.toString.call(value) === "[object Object]"
-  );
+function mergeObjects(
+  target: Record<string, unknown>,
+  source: Record<string, unknown>,
+  concat: boolean
+): Record<string, unknown> {
+  const out: Record<string, unknown> = { ...target };
+  for (const k of Object.keys(source)) {
+    const v = source[k];
+    if (!(k in out)) {
+      out[k] = v;
+      continue;
+    }
+    const cur = out[k];
+    if (isPlainObject(cur) && isPlainObject(v)) {
+      out[k] = mergeObjects(cur, v, concat);
+    } else if (concat && Array.isArray(cur) && Array.isArray(v)) {
+      out[k] = [...cur, ...v];
+    } else {
+      out[k] = v;
+    }
+  }
+  return out;
+}
+
+// Only containers in `owned` were allocated by the current fold and may be mutated;
+// anything else may be shared (e.g. YAML aliases) and is cloned on first write
+function mergeOwnedInto(
+  target: Record<string, unknown>,
+  source: Record<string, unknown>,
+  concat: boolean,
+  owned: WeakSet<object>
+): void {
+  for (const k of Object.keys(source)) {
+    const v = source[k];
+    if (!(k in target)) {
+      target[k] = v;
+      continue;
+    }
+    const cur = target[k];
+    if (isPlainObject(cur) && isPlainObject(v)) {
+      let dst = cur;
+      if (!owned.has(cur)) {
+        dst = { ...cur };
+        owned.add(dst);
+        target[k] = dst;
+      }
+      mergeOwnedInto(dst, v, concat, owned);
+    } else if (concat && Array.isArray(cur) && Array.isArray(v)) {
+      target[k] = cur.concat(v);
+    } else {
+      target[k] = v;
+    }
+  }
 }
 
 export function mergeDeep<T>(
@@ -23,15 +71,28 @@ export function mergeDeep<T>(
       : (source as unknown)) as T;
   }
   if (isPlainObject(target) && isPlainObject(source)) {
-    const out: Record<string, unknown> = { ...target };
-    for (const [k, v] of Object.entries(source)) {
-      if (k in out) {
-        out[k] = mergeDeep(out[k] as unknown, v, options);
-      } else {
-        out[k] = v;
+    return mergeObjects(target, source, arrayStrategy === "concat") as T;
+  }
+  return (source as unknown) as T;
+}
+
+// Same result as folding `values` left with mergeDeep, but each container is copied
+// at most once per fold instead of once per merge step. Inputs are never mutated.
+export function mergeDeepAll(values: unknown[], options: MergeOptions = {}): unknown {
+  const concat = options.arrayStrategy === "concat";
+  const owned = new WeakSet<object>();
+  let acc = values[0];
+  for (let i = 1; i < values.length; i++) {
+    const next = values[i];
+    if (isPlainObject(acc) && isPlainObject(next)) {
+      if (!owned.has(acc)) {
+        acc = { ...acc };
+        owned.add(acc);
       }
+      mergeOwnedInto(acc, next, concat, owned);
+    } else {
+      acc = mergeDeep(acc, next, options);
     }
-    return out as T;
   }
-  return (source as unknown) as T;
+  return acc;
 }
@@ -0,0 +1,7 @@
+export function isPlainObject(value: unknown): value is Record<string, unknown> {
+  if (typeof value !== "object" || value === null || Array.isArray(value)) return false;
+  // Fast path: parsers hand us literal objects, so skip the toString tag check
+  const proto = Object.getPrototypeOf(value) as unknown;
+  if (proto === Object.prototype || proto === null) return true;
+  return Object.prototype.toString.call(value) === "[object Object]";
+}
@@ -1,3 +1,5 @@
+import { isPlainObject } from "./object";
+
 export type RedactOptions = {
   keys?: string[];
   keyRegex?: RegExp;
@@ -20,42 +22,80 @@ const DEFAULT_KEYS = [
   "client_secret",
 ];
 
-function isPlainObject(value: unknown): value is Record<string, unknown> {
-  return (
-    typeof value === "object" &&
-    value !== null &&
-    !Array.isArray(value) &&
-    Object.prototype.toString.call(value) === "[object Object]"
-  );
+const DEFAULT_KEY_SET = new Set(DEFAULT_KEYS.map((k) => k.toLowerCase()));
+
+function childPath(parent: string | undefined, key: string): string {
+  return parent === undefined ? key : `${parent}.${key}`;
 }
 
 export function redact(value: unknown, opts: RedactOptions = {}): unknown {
-  const keys = (opts.keys ?? DEFAULT_KEYS).map((k) => k.toLowerCase());
+  const keys = opts.keys ? new Set(opts.keys.map((k) => k.toLowerCase())) : DEFAULT_KEY_SET;
   const keyRegex = opts.keyRegex;
   const pathSet = new Set((opts.paths ?? []).map((p) => p.trim()).filter(Boolean));
+  const trackPaths = pathSet.size > 0;
   const replacement = Object.prototype.hasOwnProperty.call(opts, "replacement")
     ? opts.replacement
     : "[REDACTED]";
 
-  function walk(v: unknown, pathAcc: (string | number)[] = []): unknown {
-    if (Array.isArray(v)) return v.map((item, idx) => walk(item, [...pathAcc, idx]));
+  // With only paths to match, subtrees off every path's prefix can be skipped
+  let prefixes: Set<string> | undefined;
+  if (keys.size === 0 && !keyRegex) {
+    if (!trackPaths) return value;
+    prefixes = new Set();
+    for (const p of pathSet) {
+      const parts = p.split(".");
+      for (let i = 1; i < parts.length; i++) prefixes.add(parts.slice(0, i).join("."));
+    }
+  }
+
+  function descend(v: unknown, path: string | undefined): unknown {
+    if (typeof v !== "object" || v === null) return v;
+    if (prefixes && path !== undefined && !prefixes.has(path)) return v;
+    return walk(v, path);
+  }
+
+  // Configs repeat the same key names a lot (arrays of similar objects), so decide
+  // each distinct name once instead of lowercasing and running the regex per node
+  const keyMatches = new Map<string, boolean>();
+  function matchesKey(k: string): boolean {
+    let hit = keyMatches.get(k);
+    if (hit === undefined) {
+      hit = keys.has(k.toLowerCase()) || (keyRegex ? keyRegex.test(k) : false);
+      keyMatches.set(k, hit);
+    }
+    return hit;
+  }
+
+  // Containers are copied on first change only; unchanged subtrees are shared with the input
+  function walk(v: unknown, path: string | undefined): unknown {
+    if (Array.isArray(v)) {
+      let out: unknown[] | undefined;
+      for (let i = 0; i < v.length; i++) {
+        const item: unknown = v[i];
+        const next = descend(item, trackPaths ? childPath(path, String(i)) : undefined);
+        if (!Object.is(next, item)) {
+          out ??= v.slice();
+          out[i] = next;
+        }
+      }
+      return out ?? v;
+    }
     if (isPlainObject(v)) {
-      const out: Record<string, unknown> = {};
-      for (const [k, val] of Object.entries(v)) {
-        const fullPath = [...pathAcc, k].join(".");
-        const byKey = keys.includes(k.toLowerCase());
-        const byRegex = keyRegex ? keyRegex.test(k) : false;
-        const byPath = pathSet.has(fullPath);
-        if (byKey || byRegex || byPath) {
-          out[k] = replacement;
-        } else {
-          out[k] = walk(val, [...pathAcc, k]);
+      let out: Record<string, unknown> | undefined;
+      for (const k of Object.keys(v)) {
+        const val = v[k];
+        const fullPath = trackPaths ? childPath(path, k) : undefined;
+        const byPath = fullPath !== undefined && pathSet.has(fullPath);
+        const next = matchesKey(k) || byPath ? replacement : descend(val, fullPath);
+        if (!Object.is(next, val)) {
+          out ??= { ...v };
+          out[k] = next;
         }
       }
-      return out;
+      return out ?? v;
     }
     return v;
   }
 
-  return walk(value);
+  return walk(value, undefined);
 }
@@ -0,0 +1,59 @@
+import { createHash } from "crypto";
+import Ajv, { type ErrorObject, type ValidateFunction } from "ajv";
+import { sortKeysDeep } from "./formats";
+
+export const MAX_COMPILED_SCHEMAS = 64;
+
+export interface CompileSchemaOptions {
+  // Collect every error (default) or stop at the first one when only pass/fail matters
+  allErrors?: boolean;
+}
+
+const ajvAllErrors = new Ajv({ allErrors: true });
+const ajvFirstError = new Ajv({ allErrors: false });
+type CompiledSchema = { ajv: Ajv; validate: ValidateFunction };
+// Insertion-ordered, so the first entry is always the least recently used
+const compiled = new Map<string, CompiledSchema>();
+
+function schemaKey(schema: object): string {
+  return createHash("sha256").update(JSON.stringify(sortKeysDeep(schema))).digest("base64");
+}
+
+function schemaId(schema: unknown): string | undefined {
+  const id = typeof schema === "object" && schema !== null ? (schema as { $id?: unknown }).$id : undefined;
+  return typeof id === "string" ? id.replace(/#$/, "") : undefined;
+}
+
+// Compiling is far more expensive than validating, so reuse validators for equal schemas
+export function compileSchema(schema: object, options: CompileSchemaOptions = {}): ValidateFunction {
+  const { allErrors = true } = options;
+  const key = `${allErrors ? "all" : "first"}:${schemaKey(schema)}`;
+  let entry = compiled.get(key);
+  if (entry) {
+    compiled.delete(key);
+  } else {
+    const ajv = allErrors ? ajvAllErrors : ajvFirstError;
+    const id = schemaId(schema);
+    if (id !== undefined) {
+      // Ajv refuses a second schema under an existing $id (e.g. an edited schema file);
+      // the newest one wins, so forget whatever was registered before
+      for (const [k, e] of compiled) {
+        if (e.ajv === ajv && schemaId(e.validate.schema) === id) compiled.delete(k);
+      }
+      ajv.removeSchema(id);
+    }
+    entry = { ajv, validate: ajv.compile(schema) };
+    if (compiled.size >= MAX_COMPILED_SCHEMAS) {
+      const [oldestKey, oldest] = compiled.entries().next().value as [string, CompiledSchema];
+      compiled.delete(oldestKey);
+      // Ajv keeps its own reference to every compiled schema; drop it too
+      oldest.ajv.removeSchema(oldest.validate.schema);
+    }
+  }
+  compiled.set(key, entry);
+  return entry.validate;
+}
+
+export function formatSchemaErrors(errors: ErrorObject[] | null | undefined): string {
+  return errors?.map((e) => `${e.instancePath ?? "/"} ${e.message}`).join("; ") || "Invalid";
+}
@@ -0,0 +1,49 @@
+import { describe, it, expect } from "vitest";
+import { mapConcurrent } from "../src/batch";
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+describe("mapConcurrent", () => {
+  it("keeps input order regardless of completion order", async () => {
+    const out = await mapConcurrent([30, 5, 20, 1, 10], 2, async (ms) => {
+      await sleep(ms);
+      return ms * 2;
+    });
+    expect(out).toStrictEqual([60, 10, 40, 2, 20]);
+    expect(await mapConcurrent([], 4, async (x: number) => x)).toStrictEqual([]);
+  });
+
+  it("never runs more than the limit at once", async () => {
+    let active = 0;
+    let peak = 0;
+    await mapConcurrent([1, 2, 3, 4, 5, 6], 3, async () => {
+      peak = Math.max(peak, ++active);
+      await sleep(5);
+      active--;
+    });
+    expect(peak).toBe(3);
+  });
+
+  it("stops starting items after the first failure", async () => {
+    const started: number[] = [];
+    const run = mapConcurrent([1, 2, 3, 4], 1, async (x) => {
+      started.push(x);
+      if (x === 2) throw new Error("boom");
+      return x;
+    });
+    await expect(run).rejects.toThrow("boom");
+    expect(started).toStrictEqual([1, 2]);
+  });
+
+  it("waits for in-flight items before rejecting", async () => {
+    const finished: number[] = [];
+    const run = mapConcurrent([1, 2], 2, async (x) => {
+      if (x === 1) throw new Error("fast failure");
+      await sleep(20);
+      finished.push(x);
+      return x;
+    });
+    await expect(run).rejects.toThrow("fast failure");
+    expect(finished).toStrictEqual([2]);
+  });
+});
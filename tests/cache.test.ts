@@ -0,0 +1,105 @@
+import { describe, it, expect } from "vitest";
+import fs from "fs/promises";
+import os from "os";
+import path from "path";
+import {
+  contentHash,
+  formatCacheSettings,
+  isKnownFormatted,
+  loadFormatCache,
+  pruneFormatCache,
+  recordFormatResult,
+  saveFormatCache,
+} from "../src/cache";
+
+async function tempCacheFile(): Promise<string> {
+  const dir = await fs.mkdtemp(path.join(os.tmpdir(), "allcoder-cache-"));
+  return path.join(dir, "cache.json");
+}
+
+describe("format cache", () => {
+  it("starts empty when the cache file is missing or unreadable", async () => {
+    const file = await tempCacheFile();
+    expect((await loadFormatCache(file, "s")).files.size).toBe(0);
+    await fs.writeFile(file, "not json", "utf8");
+    expect((await loadFormatCache(file, "s")).files.size).toBe(0);
+  });
+
+  it("round-trips entries and reports hits and misses", async () => {
+    const file = await tempCacheFile();
+    const cache = await loadFormatCache(file, "s");
+    const hash = contentHash("a: 1\n");
+    recordFormatResult(cache, "a.yaml", { hash, output: "a: 1\n", differs: false, written: false });
+    await saveFormatCache(cache);
+
+    const loaded = await loadFormatCache(file, "s");
+    expect(isKnownFormatted(loaded, "a.yaml", hash)).toBe(true);
+    expect(isKnownFormatted(loaded, "a.yaml", contentHash("a: 2\n"))).toBe(false);
+    expect(isKnownFormatted(loaded, "b.yaml", hash)).toBe(false);
+  });
+
+  it("drops entries for files that still need formatting on --check", () => {
+    const cache = { file: "unused", settings: "s", files: new Map([["a.json", "old"]]), dirty: false };
+    recordFormatResult(cache, "a.json", { hash: "new", output: "{}\n", differs: true, written: false });
+    expect(cache.files.has("a.json")).toBe(false);
+    expect(cache.dirty).toBe(true);
+  });
+
+  it("only marks the cache dirty when an entry actually changes", () => {
+    const cache = { file: "unused", settings: "s", files: new Map([["a.json", "h"]]), dirty: false };
+    recordFormatResult(cache, "b.json", { hash: "x", output: "{}\n", differs: true, written: false });
+    recordFormatResult(cache, "a.json", { hash: "h", output: "", differs: false, written: false });
+    expect(cache.dirty).toBe(false);
+    recordFormatResult(cache, "a.json", { hash: "h2", output: "", differs: false, written: false });
+    expect(cache.dirty).toBe(true);
+  });
+
+  it("prunes entries for files that no longer exist", async () => {
+    const file = await tempCacheFile();
+    const dir = path.dirname(file);
+    const kept = path.join(dir, "kept.json");
+    const gone = path.join(dir, "gone.json");
+    await fs.writeFile(kept, "{}\n", "utf8");
+    const cache = { file, settings: "s", files: new Map([[kept, "a"], [gone, "b"], ["matched.json", "c"]]), dirty: false };
+    await pruneFormatCache(cache, ["matched.json"]);
+    expect([...cache.files.keys()]).toStrictEqual([kept, "matched.json"]);
+    expect(cache.dirty).toBe(true);
+  });
+
+  it("stores the hash of the written output after --write", () => {
+    const cache = { file: "unused", settings: "s", files: new Map<string, string>(), dirty: false };
+    recordFormatResult(cache, "a.json", { hash: contentHash("{ }"), output: "{}\n", differs: true, written: true });
+    expect(isKnownFormatted(cache, "a.json", contentHash("{}\n"))).toBe(true);
+  });
+
+  it("keys settings on version, --format, --indent and --sort-keys", () => {
+    const base = formatCacheSettings("0.1.2", { indent: 2, sortKeys: false });
+    expect(formatCacheSettings("0.1.2", { indent: 2, sortKeys: false })).toBe(base);
+    const variants = [
+      formatCacheSettings("0.1.3", { indent: 2, sortKeys: false }),
+      formatCacheSettings("0.1.2", { format: "json", indent: 2, sortKeys: false }),
+      formatCacheSettings("0.1.2", { indent: 4, sortKeys: false }),
+      formatCacheSettings("0.1.2", { indent: 2, sortKeys: true }),
+    ];
+    expect(new Set([base, ...variants]).size).toBe(5);
+  });
+
+  it("ignores entries saved with different settings", async () => {
+    const file = await tempCacheFile();
+    const settings = formatCacheSettings("0.1.2", { indent: 2, sortKeys: false });
+    const cache = await loadFormatCache(file, settings);
+    recordFormatResult(cache, "a.json", { hash: "h", output: "", differs: false, written: false });
+    await saveFormatCache(cache);
+    expect((await loadFormatCache(file, settings)).files.size).toBe(1);
+    const upgraded = formatCacheSettings("0.1.3", { indent: 2, sortKeys: false });
+    expect((await loadFormatCache(file, upgraded)).files.size).toBe(0);
+    const reindented = formatCacheSettings("0.1.2", { indent: 4, sortKeys: false });
+    expect((await loadFormatCache(file, reindented)).files.size).toBe(0);
+  });
+
+  it("does not write the cache file when nothing changed", async () => {
+    const file = await tempCacheFile();
+    await saveFormatCache(await loadFormatCache(file, "s"));
+    await expect(fs.access(file)).rejects.toThrow();
+  });
+});
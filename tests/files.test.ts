@@ -0,0 +1,62 @@
+import { describe, it, expect } from "vitest";
+import fs from "fs/promises";
+import os from "os";
+import path from "path";
+import { formatFiles } from "../src/files";
+import { formatCacheSettings, loadFormatCache } from "../src/cache";
+
+async function fixtureDir(files: Record<string, string>): Promise<string> {
+  const dir = await fs.mkdtemp(path.join(os.tmpdir(), "allcoder-files-"));
+  for (const [name, content] of Object.entries(files)) {
+    await fs.writeFile(path.join(dir, name), content, "utf8");
+  }
+  return dir;
+}
+
+const FORMATTED = '{\n  "a": 1\n}\n';
+
+describe("formatFiles", () => {
+  it("checks several files with --check --cache and records the formatted ones", async () => {
+    const dir = await fixtureDir({ "a.json": FORMATTED, "b.json": FORMATTED, "c.json": '{"c":1}' });
+    const files = ["a.json", "b.json", "c.json"].map((f) => path.join(dir, f));
+    const location = path.join(dir, "cache.json");
+    const options = { indent: 2, sortKeys: false, check: true, write: false, cache: { location, version: "test" } };
+
+    const first = await formatFiles([...files, location], options);
+    expect(first.map((r) => [path.basename(r.file), r.differs])).toStrictEqual([
+      ["a.json", false],
+      ["b.json", false],
+      ["c.json", true],
+    ]);
+    const cache = await loadFormatCache(location, formatCacheSettings("test", { indent: 2, sortKeys: false }));
+    expect([...cache.files.keys()]).toStrictEqual([files[0], files[1]]);
+
+    const second = await formatFiles(files, options);
+    expect(second.map((r) => r.differs)).toStrictEqual([false, false, true]);
+    expect(await fs.readFile(files[2], "utf8")).toBe('{"c":1}');
+  });
+
+  it("requires --write or --check for several files", async () => {
+    const dir = await fixtureDir({ "a.json": FORMATTED, "b.json": FORMATTED });
+    const files = [path.join(dir, "a.json"), path.join(dir, "b.json")];
+    await expect(formatFiles(files, { indent: 2, sortKeys: false, check: false, write: false })).rejects.toThrow(
+      "Formatting multiple files requires --write"
+    );
+  });
+
+  it("writes nothing when any file fails to parse", async () => {
+    const dir = await fixtureDir({ "a.json": '{"a":1}', "b.json": "{ nope" });
+    const files = [path.join(dir, "a.json"), path.join(dir, "b.json")];
+    await expect(formatFiles(files, { indent: 2, sortKeys: false, check: false, write: true })).rejects.toThrow();
+    expect(await fs.readFile(files[0], "utf8")).toBe('{"a":1}');
+  });
+
+  it("writes changed files back with --write", async () => {
+    const dir = await fixtureDir({ "a.json": '{"a":1}' });
+    const file = path.join(dir, "a.json");
+    const [result] = await formatFiles([file], { indent: 2, sortKeys: false, check: false, write: true });
+    expect(result.differs).toBe(true);
+    expect(result.output).toBeUndefined();
+    expect(await fs.readFile(file, "utf8")).toBe(FORMATTED);
+  });
+});
@@ -1,5 +1,5 @@
 import { describe, it, expect } from "vitest";
-import { parseByFormat, stringifyByFormat, sortKeysDeep } from "../src";
+import { detectFormatFromPath, parseByFormat, stringifyByFormat, sortKeysDeep } from "../src";
 
 describe("YAML & TOML", () => {
   it("parses and stringifies YAML", () => {
@@ -10,6 +10,17 @@ describe("YAML & TOML", () => {
     expect(out).toBe(yaml);
   });
 
+  it("parses JSON-shaped and flow-style YAML documents", () => {
+    expect(parseByFormat("yaml", '\n{"a": [1, {"b": null}]}\n')).toStrictEqual({ a: [1, { b: null }] });
+    expect(parseByFormat("yaml", "{a: 1, b: [x, y]}")).toStrictEqual({ a: 1, b: ["x", "y"] });
+    expect(parseByFormat("yaml", '{"u": "a:b\\":c", "v": [{"w": ":"}]}')).toStrictEqual({ u: 'a:b":c', v: [{ w: ":" }] });
+  });
+
+  it("rejects duplicate keys in JSON-shaped YAML", () => {
+    expect(() => parseByFormat("yaml", '{"a": 1, "a": 2}')).toThrow();
+    expect(() => parseByFormat("yaml", '[{"b": {"c": 1, "c": 2}}]')).toThrow();
+  });
+
   it("round-trips TOML", () => {
     const obj = { a: 1, arr: [1, 2], nested: { c: 2 } };
     const toml = stringifyByFormat("toml", obj);
@@ -24,3 +35,21 @@ describe("YAML & TOML", () => {
     expect(yaml).toBe("a:\n  c: 1\n  d: 2\nb: 1\n");
   });
 });
+
+describe("JSONC & JSON5", () => {
+  it("parses strict JSON and extended syntax", () => {
+    expect(parseByFormat("jsonc", '{"a":[1,2]}')).toStrictEqual({ a: [1, 2] });
+    expect(parseByFormat("jsonc", '// c\n{"a": 1, /* b */ "b": 2}')).toStrictEqual({ a: 1, b: 2 });
+    expect(parseByFormat("json5", "{a: 'x', b: [1,],}")).toStrictEqual({ a: "x", b: [1] });
+  });
+});
+
+describe("detectFormatFromPath", () => {
+  it("maps known extensions case-insensitively", () => {
+    expect(detectFormatFromPath("conf/app.YML")).toBe("yaml");
+    expect(detectFormatFromPath("settings.jsonc")).toBe("jsonc");
+    expect(detectFormatFromPath("Cargo.toml")).toBe("toml");
+    expect(detectFormatFromPath("README.md")).toBeNull();
+    expect(detectFormatFromPath("json")).toBeNull();
+  });
+});
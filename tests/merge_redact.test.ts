@@ -1,5 +1,5 @@
 import { describe, it, expect } from "vitest";
-import { mergeDeep, redact } from "../src";
+import { mergeDeep, mergeDeepAll, parseByFormat, redact } from "../src";
 
 describe("merge & redact", () => {
   it("deep merges objects with array replace by default", () => {
@@ -16,6 +16,32 @@ describe("merge & redact", () => {
     expect(merged).toStrictEqual({ arr: [1, 2, 3] });
   });
 
+  it("merges nested objects without mutating inputs", () => {
+    const a = { x: { y: { z: 1 } }, n: null };
+    const b = { x: { y: { w: 2 } }, n: { k: 1 } };
+    const merged = mergeDeep(a, b);
+    expect(merged).toStrictEqual({ x: { y: { z: 1, w: 2 } }, n: { k: 1 } });
+    expect(a).toStrictEqual({ x: { y: { z: 1 } }, n: null });
+  });
+
+  it("folds several values like repeated mergeDeep", () => {
+    const docs = [{ a: 1, b: { c: 1 }, arr: [1] }, { b: { d: 2 }, arr: [2] }, { b: { c: 3 }, arr: [3] }];
+    const merged = mergeDeepAll(docs, { arrayStrategy: "concat" });
+    expect(merged).toStrictEqual({ a: 1, b: { c: 3, d: 2 }, arr: [1, 2, 3] });
+    expect(docs[0]).toStrictEqual({ a: 1, b: { c: 1 }, arr: [1] });
+    expect(mergeDeepAll([{ a: 1 }, [1], 2])).toBe(2);
+  });
+
+  it("does not leak merged keys through shared subtrees", () => {
+    const base = parseByFormat("yaml", "defaults: &d\n  x: 1\ndev: *d\nprod: *d\n");
+    const merged = mergeDeepAll([base, { prod: { x: 2 } }, { prod: { y: 3 } }]);
+    expect(merged).toStrictEqual({ defaults: { x: 1 }, dev: { x: 1 }, prod: { x: 2, y: 3 } });
+    expect(base).toStrictEqual({ defaults: { x: 1 }, dev: { x: 1 }, prod: { x: 1 } });
+
+    const aliased = parseByFormat("yaml", "a: &s\n  x: 1\nb: *s\n");
+    expect(mergeDeepAll([{}, aliased, { b: { y: 2 } }])).toStrictEqual({ a: { x: 1 }, b: { x: 1, y: 2 } });
+  });
+
   it("redacts default sensitive keys", () => {
     const obj = { password: "p", nested: { apiKey: "x", ok: 1 } };
     const r = redact(obj);
@@ -27,4 +53,19 @@ describe("merge & redact", () => {
     const r = redact(obj, { keys: ["token"], replacement: null });
     expect(r).toStrictEqual({ token: null, app: { secret: "def" } });
   });
+
+  it("redacts dot-paths through arrays", () => {
+    const obj = { users: [{ name: "a", pin: 1 }, { name: "b", pin: 2 }], pin: 3 };
+    const r = redact(obj, { keys: [], paths: ["users.1.pin", "pin"] });
+    expect(r).toStrictEqual({ users: [{ name: "a", pin: 1 }, { name: "b", pin: "[REDACTED]" }], pin: "[REDACTED]" });
+  });
+
+  it("shares unchanged subtrees with the input", () => {
+    const obj = { a: { b: [1, { c: 2 }] }, d: { token: "t" } };
+    const r = redact(obj) as typeof obj;
+    expect(r).toStrictEqual({ a: { b: [1, { c: 2 }] }, d: { token: "[REDACTED]" } });
+    expect(r.a).toBe(obj.a);
+    expect(obj.d.token).toBe("t");
+    expect(redact(obj.a)).toBe(obj.a);
+  });
 });
@@ -0,0 +1,61 @@
+import { describe, it, expect } from "vitest";
+import { compileSchema, formatSchemaErrors, MAX_COMPILED_SCHEMAS } from "../src";
+
+describe("compileSchema", () => {
+  it("reuses the compiled validator for equal schemas", () => {
+    const a = compileSchema({ type: "object", required: ["name"] });
+    const b = compileSchema({ required: ["name"], type: "object" });
+    expect(b).toBe(a);
+    expect(a({ name: "x" })).toBe(true);
+    expect(a({})).toBe(false);
+    expect(formatSchemaErrors(a.errors)).toContain("must have required property 'name'");
+  });
+
+  it("stops at the first error when allErrors is off", () => {
+    const schema = { type: "object", required: ["a", "b"] };
+    const all = compileSchema(schema);
+    const first = compileSchema(schema, { allErrors: false });
+    expect(first).not.toBe(all);
+    expect(all({})).toBe(false);
+    expect(all.errors).toHaveLength(2);
+    expect(first({})).toBe(false);
+    expect(first.errors).toHaveLength(1);
+  });
+
+  it("replaces an earlier schema registered under the same $id", () => {
+    const v1 = compileSchema({ $id: "urn:allcoder:test:edited", type: "string" });
+    expect(v1("x")).toBe(true);
+    const v2 = compileSchema({ $id: "urn:allcoder:test:edited", type: "number" });
+    expect(v2(1)).toBe(true);
+    expect(v2("x")).toBe(false);
+    const v3 = compileSchema({ $id: "urn:allcoder:test:edited#", type: "boolean" });
+    expect(v3(true)).toBe(true);
+  });
+
+  it("evicts the least recently used validator once the cache is full", () => {
+    const plain = { type: "integer", minimum: 10 };
+    const withId = { $id: "urn:allcoder:test:evicted", type: "integer" };
+    const firstPlain = compileSchema(plain);
+    compileSchema(withId);
+    const kept = compileSchema({ const: "kept" });
+    for (let i = 0; i < MAX_COMPILED_SCHEMAS - 1; i++) {
+      compileSchema({ const: i });
+      // Touching an entry moves it to the back of the eviction order
+      if (i === 0) expect(compileSchema({ const: "kept" })).toBe(kept);
+    }
+    expect(compileSchema({ const: "kept" })).toBe(kept);
+
+    const againPlain = compileSchema(plain);
+    expect(againPlain).not.toBe(firstPlain);
+    expect(againPlain(12)).toBe(true);
+    expect(againPlain(3)).toBe(false);
+
+    // Eviction also removed it from Ajv, so the $id can be registered again
+    const againWithId = compileSchema(withId);
+    expect(againWithId(1)).toBe(true);
+  });
+
+  it("falls back to a generic message without errors", () => {
+    expect(formatSchemaErrors(null)).toBe("Invalid");
+  });
+});
@@ -1,11 +1,6 @@
 import { describe, it, expect } from "vitest";
-import Ajv, { ErrorObject } from "ajv";
-
-function formatAjvErrors(errors: ErrorObject[] | null | undefined): string {
-  return (
-    errors?.map((e) => `${e.instancePath ?? '/'} ${e.message}`)?.join("; ") || "Invalid"
-  );
-}
+import Ajv from "ajv";
+import { formatSchemaErrors } from "../src";
 
 describe("Schema validation error details", () => {
   it("uses instancePath (not dataPath) when formatting error details", () => {
@@ -36,7 +31,7 @@ describe("Schema validation error details", () => {
     const ok = validate(data);
     expect(ok).toBe(false);
 
-    const details = formatAjvErrors(validate.errors);
+    const details = formatSchemaErrors(validate.errors);
 
     // Must include instancePath-based locations
     expect(details).toContain("/name");